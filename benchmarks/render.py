@@ -0,0 +1,126 @@
+"""
+Headless rendering benchmark.
+
+Renders a few scripted positions with SDL's dummy video driver and reports the frame time percentiles of each one, so rendering
+regressions can be caught without a display. Run it from the root of the repository:
+
+    python -m benchmarks.render --frames 300 --max-p95 5
+"""
+import argparse
+import json
+import os
+import sys
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+from src.core.constants import WIDTH, HEIGHT, BLACK, WHITE
+from src.core.game import Game
+from src.core.frame_stats import FrameStats
+from src.ai import minimax
+
+# Number of plies played by the AI from the initial position to reach each scripted position
+SCRIPTED_PLIES = {'opening': 0, 'early middlegame': 10, 'middlegame': 20, 'endgame': 40}
+SCRIPT_DEPTH = 2
+
+def play_plies(game, plies):
+    """
+    Plays a number of plies on the game with the AI on both sides. The search is deterministic, so the same position is reached every time.
+    The moves are made on the gameboard directly, since only the position is rendered and Game.change_turn prints every turn.
+
+    Parameters:
+    game (Game): The game to play on.
+    plies (int): The number of plies to play.
+    """
+    for _ in range(plies):
+        value, move = minimax(game.get_board(), SCRIPT_DEPTH, game.turn == BLACK, game)
+        if move is None or game.winner() is not None:
+            break
+        game.gameboard.make_move(move)
+        game.turn = WHITE if game.turn == BLACK else BLACK
+
+def select_first_movable_piece(game):
+    """
+    Selects the first piece of the player to move that has valid moves, so the valid move markers are drawn too.
+
+    Parameters:
+    game (Game): The game to select a piece in.
+    """
+    for piece in game.gameboard.get_all_pieces(game.turn):
+        if game.gameboard.get_valid_moves(piece):
+            game.select(piece.row, piece.col)
+            return
+
+def benchmark_position(window, plies, frames, overlay):
+    """
+    Renders a scripted position a number of times and measures every frame.
+
+    Parameters:
+    window (pygame.Surface): The window to render on.
+    plies (int): The number of plies played from the initial position.
+    frames (int): The number of frames to render.
+    overlay (bool): True to draw the frame time overlay on every frame too.
+
+    Returns:
+    dict: The summary returned by FrameStats.summary.
+    """
+    game = Game(window)
+    play_plies(game, plies)
+    select_first_movable_piece(game)
+
+    frame_stats = FrameStats(size=frames)
+    for _ in range(frames):
+        frame_stats.begin_frame()
+        with frame_stats.section('draw'):
+            game.draw()
+        if overlay:
+            with frame_stats.section('overlay'):
+                frame_stats.draw(window)
+        with frame_stats.section('flip'):
+            pygame.display.update()
+        frame_stats.end_frame()
+    return frame_stats.summary()
+
+def main(argv=None):
+    """
+    Runs the benchmark and prints the results.
+
+    Returns:
+    int: 0 if every position is within the thresholds, 1 otherwise.
+    """
+    parser = argparse.ArgumentParser(description='Headless rendering benchmark.')
+    parser.add_argument('--frames', type=int, default=300, help='number of frames rendered per position')
+    parser.add_argument('--overlay', action='store_true', help='draw the frame time overlay too')
+    parser.add_argument('--max-p95', type=float, default=None, help='fail if the p95 frame time of a position is above this many milliseconds')
+    parser.add_argument('--max-p99', type=float, default=None, help='fail if the p99 frame time of a position is above this many milliseconds')
+    parser.add_argument('--output', default=None, help='write the results to this JSON file')
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    window = pygame.display.set_mode((WIDTH, HEIGHT))
+
+    results = {}
+    failed = False
+    for name, plies in SCRIPTED_PLIES.items():
+        summary = benchmark_position(window, plies, args.frames, args.overlay)
+        results[name] = summary
+        print(f"{name:<18} p50 {summary['p50']:6.2f} ms  p95 {summary['p95']:6.2f} ms  p99 {summary['p99']:6.2f} ms")
+
+        if args.max_p95 is not None and summary['p95'] > args.max_p95:
+            print(f"  p95 is above the {args.max_p95} ms threshold")
+            failed = True
+        if args.max_p99 is not None and summary['p99'] > args.max_p99:
+            print(f"  p99 is above the {args.max_p99} ms threshold")
+            failed = True
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2)
+
+    pygame.quit()
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,238 @@
+"""
+Search regression benchmark.
+
+Searches a fixed corpus of opening, middlegame and endgame positions (benchmarks/positions.json) with the same minimax as in play, and
+measures the time to reach the depth, the nodes searched per second, the peak memory of the search (with tracemalloc) and whether the
+best move found is one of the expected ones. The results can be saved as a baseline and later runs compared against it, failing when
+a threshold is crossed:
+
+    python -m benchmarks.search --save-baseline search_baseline.json
+    python -m benchmarks.search --baseline search_baseline.json --max-slowdown 1.25
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+from src.core.constants import BLACK, WHITE, ROWS, COLS
+from src.core.gameboard import Gameboard
+from src.core.piece import Piece
+from src.core.move import Move
+from src.ai import minimax, TranspositionTable
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'positions.json')
+
+# Letters of the board diagrams of the corpus: b/w for black/white men, B/W for kings, anything else for an empty square
+PIECES = {'b': (BLACK, False), 'B': (BLACK, True), 'w': (WHITE, False), 'W': (WHITE, True)}
+
+def board_from_rows(rows):
+    """
+    Creates a gameboard from a diagram of the board, one string of eight letters for each row from the top.
+
+    Parameters:
+    rows (list): The rows of the diagram.
+
+    Returns:
+    Gameboard: The gameboard with the pieces of the diagram.
+    """
+    board = Gameboard()
+    board.gameboard = [[0] * COLS for _ in range(ROWS)]
+    # The king counters stay at 0, as they do in play, where a piece is crowned before Gameboard.move checks whether it was a king
+    board.black_left = board.white_left = 0
+    for row, letters in enumerate(rows):
+        for col, letter in enumerate(letters):
+            if letter not in PIECES:
+                continue
+            color, king = PIECES[letter]
+            piece = Piece(row, col, color)
+            piece.king = king
+            board.gameboard[row][col] = piece
+            if color == BLACK:
+                board.black_left += 1
+            else:
+                board.white_left += 1
+    return board
+
+def load_corpus(path=CORPUS):
+    """
+    Reads the positions of the corpus.
+
+    Parameters:
+    path (str): The path of the corpus.
+
+    Returns:
+    list: A list of dictionaries with the 'name', 'phase', 'board', 'to_move', 'depth' and 'best' moves of every position.
+    """
+    with open(path) as file:
+        return json.load(file)['positions']
+
+def search(position, counting=True):
+    """
+    Searches a position of the corpus to its depth like the AI does in play, with a new transposition table.
+
+    Parameters:
+    position (dict): The position, as returned by load_corpus.
+    counting (bool): True to count the nodes searched.
+
+    Returns:
+    (Move, int, float): The best move, the number of nodes searched and the time the search took in seconds.
+    """
+    board = board_from_rows(position['board'])
+    nodes = 0
+    if counting:
+        make_move = board.make_move
+
+        def counted_make_move(move):
+            nonlocal nodes
+            nodes += 1
+            return make_move(move)
+        board.make_move = counted_make_move
+
+    start = time.perf_counter()
+    value, move = minimax(board, position['depth'], position['to_move'] == 'BLACK', None, table=TranspositionTable())
+    return move, nodes, time.perf_counter() - start
+
+def benchmark_position(position, repeat):
+    """
+    Measures the search of a position of the corpus.
+
+    Parameters:
+    position (dict): The position, as returned by load_corpus.
+    repeat (int): The number of timed searches, of which the fastest one is kept.
+
+    Returns:
+    dict: The time, nodes, nodes per second, peak memory in bytes, best move and whether it is one of the expected moves.
+    """
+    move, nodes, elapsed = search(position)
+    for _ in range(repeat - 1):
+        elapsed = min(elapsed, search(position, counting=False)[2])
+
+    # tracemalloc slows the search down, so the memory is measured on a separate search
+    tracemalloc.start()
+    search(position, counting=False)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    expected = [Move.from_list(best) for best in position['best']]
+    return {
+        'phase': position['phase'],
+        'depth': position['depth'],
+        'time': elapsed,
+        'nodes': nodes,
+        'nps': nodes / elapsed if elapsed else 0.0,
+        'peak_memory': peak,
+        'move': move.to_list() if move is not None else None,
+        'agrees': move in expected,
+    }
+
+def run(corpus, repeat=1):
+    """
+    Measures every position of the corpus and the totals.
+
+    Parameters:
+    corpus (list): The positions, as returned by load_corpus.
+    repeat (int): The number of timed searches of each position.
+
+    Returns:
+    dict: The 'positions' results by name and the 'totals'.
+    """
+    positions = {}
+    for position in corpus:
+        result = benchmark_position(position, repeat)
+        positions[position['name']] = result
+        print(f"{position['name']:<24} depth {result['depth']}  {result['time'] * 1000:9.1f} ms  {result['nodes']:8} nodes  {result['nps']:9.0f} nodes/s  "
+              f"{result['peak_memory'] / 1024:8.1f} KiB  {'agrees' if result['agrees'] else 'DISAGREES'}")
+
+    total_time = sum(result['time'] for result in positions.values())
+    total_nodes = sum(result['nodes'] for result in positions.values())
+    totals = {
+        'time': total_time,
+        'nodes': total_nodes,
+        'nps': total_nodes / total_time if total_time else 0.0,
+        'peak_memory': max((result['peak_memory'] for result in positions.values()), default=0),
+        'agreement': sum(result['agrees'] for result in positions.values()) / len(positions) if positions else 0.0,
+    }
+    print(f"{'total':<24}          {totals['time'] * 1000:9.1f} ms  {totals['nodes']:8} nodes  {totals['nps']:9.0f} nodes/s  "
+          f"{totals['peak_memory'] / 1024:8.1f} KiB  agreement {totals['agreement']:.0%}")
+    return {'positions': positions, 'totals': totals}
+
+def compare(results, baseline, max_slowdown, max_node_growth, max_memory_growth, max_agreement_drop):
+    """
+    Compares results with a baseline and returns the regressions. Times are only compared in total, since the searches of single positions are too short to be timed reliably.
+
+    Parameters:
+    results (dict): The results returned by run.
+    baseline (dict): The results of an earlier run.
+    max_slowdown (float): The largest allowed ratio of the total time to the baseline total time.
+    max_node_growth (float): The largest allowed ratio of the nodes of a position to its baseline nodes.
+    max_memory_growth (float): The largest allowed ratio of the peak memory of a position to its baseline peak memory.
+    max_agreement_drop (float): The largest allowed drop of the share of positions that agree with the expected moves.
+
+    Returns:
+    list: A list of messages, one for each regression.
+    """
+    regressions = []
+    totals, base_totals = results['totals'], baseline['totals']
+    if base_totals['time'] and totals['time'] / base_totals['time'] > max_slowdown:
+        regressions.append(f"total time {totals['time']:.3f} s is {totals['time'] / base_totals['time']:.2f}x the baseline {base_totals['time']:.3f} s")
+    if base_totals['nps'] and base_totals['nps'] / max(totals['nps'], 1e-9) > max_slowdown:
+        regressions.append(f"nodes/s {totals['nps']:.0f} is below the baseline {base_totals['nps']:.0f}")
+    if base_totals['agreement'] - totals['agreement'] > max_agreement_drop:
+        regressions.append(f"agreement {totals['agreement']:.0%} dropped from the baseline {base_totals['agreement']:.0%}")
+
+    for name, result in results['positions'].items():
+        base = baseline['positions'].get(name)
+        if base is None:
+            continue
+        if base['nodes'] and result['nodes'] / base['nodes'] > max_node_growth:
+            regressions.append(f"{name}: {result['nodes']} nodes, {result['nodes'] / base['nodes']:.2f}x the baseline {base['nodes']}")
+        if base['peak_memory'] and result['peak_memory'] / base['peak_memory'] > max_memory_growth:
+            regressions.append(f"{name}: peak memory {result['peak_memory']} bytes, {result['peak_memory'] / base['peak_memory']:.2f}x the baseline {base['peak_memory']}")
+        if base['agrees'] and not result['agrees']:
+            regressions.append(f"{name}: plays {Move.from_list(result['move']) if result['move'] else None} instead of an expected move")
+    return regressions
+
+def main(argv=None):
+    """
+    Runs the benchmark, saves or compares the results, and prints the regressions.
+
+    Returns:
+    int: 0 if there are no regressions, 1 otherwise.
+    """
+    parser = argparse.ArgumentParser(description='Search regression benchmark on a fixed corpus of positions.')
+    parser.add_argument('--corpus', default=CORPUS, help='file of the positions')
+    parser.add_argument('--repeat', type=int, default=3, help='number of timed searches of each position, the fastest one is kept')
+    parser.add_argument('--output', default=None, help='write the results to this JSON file')
+    parser.add_argument('--save-baseline', default=None, help='write the results to this JSON file to compare later runs against')
+    parser.add_argument('--baseline', default=None, help='compare the results against this JSON file')
+    parser.add_argument('--max-slowdown', type=float, default=1.25, help='largest allowed ratio of the total time (and inverse ratio of nodes/s) to the baseline')
+    parser.add_argument('--max-node-growth', type=float, default=1.10, help='largest allowed ratio of the nodes of a position to the baseline')
+    parser.add_argument('--max-memory-growth', type=float, default=1.25, help='largest allowed ratio of the peak memory of a position to the baseline')
+    parser.add_argument('--max-agreement-drop', type=float, default=0.0, help='largest allowed drop of the share of positions playing an expected move')
+    args = parser.parse_args(argv)
+
+    results = run(load_corpus(args.corpus), args.repeat)
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, 'w') as file:
+                json.dump(results, file, indent=2)
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    regressions = compare(results, baseline, args.max_slowdown, args.max_node_growth, args.max_memory_growth, args.max_agreement_drop)
+    for regression in regressions:
+        print(f"REGRESSION: {regression}")
+    if regressions:
+        return 1
+    print("No regressions against the baseline.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,142 @@
+"""
+Measures what keying cached positions by their canonical form saves on self-play data.
+
+Plays a few self-play games, searches every position with one transposition table keyed by the positions as they are and one keyed by
+their canonical form, both kept for the whole run like a shared evaluation cache, and prints the hit rate and size of each table:
+
+    python -m benchmarks.symmetry --games 10 --depth 4
+
+A position and its mirror can both be reached from the initial position, but in self-play such pairs are rare: with 10 games at depth 4
+both tables end with the same hit rate (29.85%) and the same 12602 entries. --endgames plays the games from random king endgames
+instead, where the canonical form saves a little more:
+
+    python -m benchmarks.symmetry --endgames --games 20 --kings 2 --seed 1
+"""
+import argparse
+import os
+import random
+
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+from src.core.constants import BLACK, WHITE, ROWS, COLS
+from src.core.gameboard import Gameboard
+from src.core.piece import Piece
+from src.core.symmetry import DARK_SQUARES
+from src.ai import minimax, TranspositionTable
+
+def start_board(pieces):
+    """
+    Creates the board a game starts from.
+
+    Parameters:
+    pieces (list or None): A list of (row, col, color) tuples of kings, or None for the initial position.
+
+    Returns:
+    Gameboard: The board.
+    """
+    board = Gameboard()
+    if pieces is None:
+        return board
+    board.gameboard = [[0] * COLS for _ in range(ROWS)]
+    board.black_left = board.white_left = 0
+    for row, col, color in pieces:
+        piece = Piece(row, col, color)
+        piece.king = True
+        board.gameboard[row][col] = piece
+        if color == BLACK:
+            board.black_left += 1
+        else:
+            board.white_left += 1
+    return board
+
+def random_endgame(rng, kings):
+    """
+    Returns the kings of a random endgame with the same number of kings on each side.
+
+    Parameters:
+    rng (random.Random): The random generator.
+    kings (int): The number of kings of each side.
+
+    Returns:
+    list: A list of (row, col, color) tuples.
+    """
+    squares = rng.sample(DARK_SQUARES, 2 * kings)
+    return [(row, col, BLACK if i < kings else WHITE) for i, (row, col) in enumerate(squares)]
+
+def self_play_games(games, depth, seed, max_plies=100, endgame_kings=0):
+    """
+    Plays self-play games. The AI plays a random move now and then, so the games differ.
+
+    Parameters:
+    games (int): The number of games.
+    depth (int): The depth of the search of the AI.
+    seed (int): The seed of the random moves.
+    max_plies (int): The maximum number of plies of a game.
+    endgame_kings (int): The number of kings of each side of the random endgames the games start from, or 0 to start from the initial position.
+
+    Returns:
+    list: A list of games, each one a (start pieces, list of Move objects) tuple, with the start pieces as taken by start_board.
+    """
+    rng = random.Random(seed)
+    records = []
+    for _ in range(games):
+        pieces = random_endgame(rng, endgame_kings) if endgame_kings else None
+        board = start_board(pieces)
+        moves = []
+        color = WHITE
+        while len(moves) < max_plies and board.winner() is None and board.has_moves(color):
+            if rng.random() < 0.25:
+                move = rng.choice(list(board.iter_moves(color)))
+            else:
+                move = minimax(board, depth, color == BLACK, None)[1]
+            board.make_move(move)
+            moves.append(move)
+            color = BLACK if color == WHITE else WHITE
+        records.append((pieces, moves))
+    return records
+
+def measure(records, depth, canonical):
+    """
+    Searches every position of the games with one transposition table kept for the whole run.
+
+    Parameters:
+    records (list): The games returned by self_play_games.
+    depth (int): The depth of the search.
+    canonical (bool): True to key the table by the canonical form of the positions.
+
+    Returns:
+    TranspositionTable: The table, with its counters.
+    """
+    table = TranspositionTable(size=10 ** 7, canonical=canonical)
+    for pieces, moves in records:
+        board = start_board(pieces)
+        color = WHITE
+        for move in moves:
+            minimax(board, depth, color == BLACK, None, table=table)
+            board.make_move(move)
+            color = BLACK if color == WHITE else WHITE
+    return table
+
+def main(argv=None):
+    """
+    Runs the measurement and prints the results.
+    """
+    parser = argparse.ArgumentParser(description='Hit rate and size of position caches keyed with and without the canonical form.')
+    parser.add_argument('--games', type=int, default=10, help='number of self-play games')
+    parser.add_argument('--depth', type=int, default=4, help='depth of the searches')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the random moves of the self-play games')
+    parser.add_argument('--endgames', action='store_true', help='start the games from random king endgames instead of the initial position')
+    parser.add_argument('--kings', type=int, default=2, help='number of kings of each side in the endgames')
+    parser.add_argument('--max-plies', type=int, default=None, help='maximum number of plies of a game, 100 by default and 40 with --endgames')
+    args = parser.parse_args(argv)
+
+    max_plies = args.max_plies or (40 if args.endgames else 100)
+    records = self_play_games(args.games, args.depth, args.seed, max_plies, args.kings if args.endgames else 0)
+    print(f"{sum(len(moves) for pieces, moves in records)} positions from {len(records)} games")
+    for name, canonical in (('plain', False), ('canonical', True)):
+        table = measure(records, args.depth, canonical)
+        print(f"{name:<10} hit rate {table.hit_rate():6.2%}  hits {table.hits:8}  lookups {table.lookups:8}  entries {len(table):8}")
+
+
+if __name__ == '__main__':
+    main()
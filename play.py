@@ -2,9 +2,15 @@ import pygame
 from pygame.locals import *
 from src.core.constants import WIDTH, HEIGHT, SQUARE_SIZE, WHITE, BLACK
 from src.core.game import Game
-from src.ai import minimax
+from src.core.gameboard import Gameboard
+from src.core.resources import resources
+from src.core.frame_stats import FrameStats
+from src.ai import minimax, TranspositionTable
 
 FPS = 60
+SHOW_FRAME_STATS = False  # Show the frame time overlay when the game starts, it can also be toggled with F3
+FRAME_STATS_LOG_EVERY = 600  # Number of frames between two frame time summaries printed while the overlay is shown
+GAMES_FILE = 'games.jsonl'  # File that finished games are appended to, so they can be analysed later, or None to not save them
 WINDOW = pygame.display.set_mode((WIDTH, HEIGHT))
 game_over = False
 winner = None
@@ -39,49 +45,54 @@ def show_menu(window, game_over=False, winner=None):
     int: The index of the chosen option (1 for start game, 2 for quit).
     """
     pygame.init()
-    menu_font = pygame.font.Font(None, 36)
     menu_text = ["Start Game", "Quit"]
-    menu_buttons = [menu_font.render(text, True, WHITE) for text in menu_text]
+    menu_buttons = [resources.text(text, 36, WHITE) for text in menu_text]
     button_rects = [button.get_rect(center=(WIDTH // 2, i * 100 + HEIGHT // 2)) for i, button in enumerate(menu_buttons)]
     button_colors = [BLACK, BLACK]
-
-    while True:
-        for event in pygame.event.get():
-            if event.type == QUIT:
-                pygame.quit()
-                exit()
-
-            if event.type == MOUSEBUTTONDOWN:
-                mouse_pos = pygame.mouse.get_pos()
-                for i, rect in enumerate(button_rects):
-                    if rect.collidepoint(mouse_pos):
-                        return i + 1  # Return the button index (1-indexed)
-                    
-        
-        game = Game(WINDOW)
-        game.gameboard.draw_squares(window)
+    winner_text = f"Winner: {winner}" if game_over and winner is not None else None
+
+    def render_menu():
+        """
+        Renders the whole menu screen on a new surface, so it is only drawn once for every winner.
+        """
+        surface = pygame.Surface((WIDTH, HEIGHT))
+        surface.blit(resources.surface('board', Gameboard.render_squares), (0, 0))
         for button, rect, color in zip(menu_buttons, button_rects, button_colors):
-            pygame.draw.rect(window, color, rect.inflate(10, 10))  # Draw colored button background
-            window.blit(button, rect)  # Draw button text
+            pygame.draw.rect(surface, color, rect.inflate(10, 10))  # Draw colored button background
+            surface.blit(button, rect)  # Draw button text
 
-        if game_over and winner is not None:
-            winner_text = f"Winner: {winner}"
+        if winner_text is not None:
             # Render text with white color
-            winner_font = pygame.font.Font(None, 48)
-            winner_surface = winner_font.render(winner_text, True, WHITE)
+            winner_surface = resources.text(winner_text, 48, WHITE)
             winner_rect = winner_surface.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 100))
 
             # Render text with black outline
-            outline_font = pygame.font.Font(None, 48)
-            outline_surface = outline_font.render(winner_text, True, BLACK)
+            outline_surface = resources.text(winner_text, 48, BLACK)
             outline_rect = outline_surface.get_rect(center=(WIDTH // 2 + 2, HEIGHT // 2 - 98))  # Slightly offset for the outline effect
 
             # Blit the outline first and then the text on top
-            window.blit(outline_surface, outline_rect)
-            window.blit(winner_surface, winner_rect)
+            surface.blit(outline_surface, outline_rect)
+            surface.blit(winner_surface, winner_rect)
+        return surface
+
+    menu_surface = resources.surface(f"menu:{winner_text}", render_menu)
 
+    while True:
+        window.blit(menu_surface, (0, 0))
         pygame.display.flip()
 
+        # Sleep until something happens instead of redrawing the same screen continuously
+        event = pygame.event.wait()
+        if event.type == QUIT:
+            pygame.quit()
+            exit()
+
+        if event.type == MOUSEBUTTONDOWN:
+            mouse_pos = pygame.mouse.get_pos()
+            for i, rect in enumerate(button_rects):
+                if rect.collidepoint(mouse_pos):
+                    return i + 1  # Return the button index (1-indexed)
+
 
 
 def run_game():
@@ -94,32 +105,62 @@ def run_game():
     run = True
     clock = pygame.time.Clock()
     game = Game(WINDOW)
+    table = TranspositionTable()  # Kept for the whole game, so each AI turn starts from what the previous searches found
+    frame_stats = FrameStats(log_every=FRAME_STATS_LOG_EVERY)
+    show_frame_stats = SHOW_FRAME_STATS
     global game_over
     global winner 
     
     while run:
         clock.tick(FPS)
+        frame_stats.begin_frame()
 
-        if game.turn == BLACK:
-            value, new_board = minimax(game.get_board(), 4, True, game)
-            game.ai_move(new_board)
+        with frame_stats.section('ai'):
+            if game.turn == BLACK:
+                table.prune(game.get_board())
+                value, move = minimax(game.get_board(), 4, True, game, table=table)
+                game.ai_move(move)
 
         if game.winner() is not None:
             winner = game.winner()
             game_over = True
+            if GAMES_FILE:
+                game.history.save(GAMES_FILE, winner)
             return winner  # Return the winner when the game ends
 
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                run = False
-            
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                pos = pygame.mouse.get_pos()
-                print(pos)
-                row, col = get_row_col_from_mouse(pos)
-                game.select(row, col)
-
-        game.update()
+        with frame_stats.section('events'):
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    run = False
+                
+                if event.type == pygame.MOUSEBUTTONDOWN:
+                    pos = pygame.mouse.get_pos()
+                    print(pos)
+                    row, col = get_row_col_from_mouse(pos)
+                    game.select(row, col)
+
+                if event.type == pygame.KEYDOWN:
+                    # Undo or redo a whole turn, so the AI's reply is taken back or replayed together with the player's move
+                    if event.key == pygame.K_u:
+                        game.undo()
+                        if game.turn == BLACK:
+                            game.undo()
+                    elif event.key == pygame.K_r:
+                        game.redo()
+                        if game.turn == BLACK:
+                            game.redo()
+                    elif event.key == pygame.K_F3:
+                        show_frame_stats = not show_frame_stats
+
+        with frame_stats.section('draw'):
+            game.draw()
+            if show_frame_stats:
+                frame_stats.draw(WINDOW)
+            pygame.display.update()
+
+        # Only print the summaries while the overlay is shown
+        frame_stats.log_every = FRAME_STATS_LOG_EVERY if show_frame_stats else 0
+        frame_stats.end_frame()
 
     return None  # Return None when the game doesn't end
 
@@ -1 +1,2 @@
-from .minimax import minimax
\ No newline at end of file
+from .minimax import minimax
+from .transposition import TranspositionTable
\ No newline at end of file
@@ -0,0 +1,228 @@
+"""
+Batch analysis of stored games.
+
+Replays the games saved with MoveHistory.save, searches every position with the same minimax used in play, and writes one JSON line per
+move with the best move, the score lost by the played move and a blunder/mistake flag. Positions are split across a process pool and the
+output file doubles as the checkpoint: moves already in it are skipped, so an interrupted run resumes where it stopped.
+
+    python -m src.ai.analysis games.jsonl --output analysis.jsonl --depth 4 --workers 4
+"""
+import argparse
+import json
+import os
+import time
+from multiprocessing import Pool
+from ..core.constants import BLACK, WHITE
+from ..core.gameboard import Gameboard
+from ..core.history import load_games
+from ..core.move import Move
+from .minimax import minimax
+from .transposition import TranspositionTable
+
+MISTAKE = 1.0  # Score drop, in pieces, from which a move is flagged as a mistake
+BLUNDER = 2.0  # Score drop, in pieces, from which a move is flagged as a blunder
+WIN_SCORE = 100.0  # Score written for a won position, which minimax scores as infinite, above any material difference
+CHECKPOINT_BLOCK = 4096  # Bytes read at a time from the end of the output file when looking for its last complete line
+
+def finite_score(score):
+    """
+    Returns a score that can be written as JSON: the infinite scores of won and lost positions become WIN_SCORE and -WIN_SCORE.
+
+    Parameters:
+    score (float): The score returned by minimax.
+
+    Returns:
+    float: The score, between -WIN_SCORE and WIN_SCORE.
+    """
+    return max(-WIN_SCORE, min(WIN_SCORE, score))
+
+def search(board, color, depth, time_limit=None, table=None):
+    """
+    Searches a position for the player to move, with the same minimax as in play. With a time limit the search is deepened one ply at a time, and no new depth is started once the time is up.
+
+    Parameters:
+    board (Gameboard): The position to search.
+    color (int): The color of the player to move (WHITE or BLACK).
+    depth (int): The depth of the search, or the maximum depth with a time limit.
+    time_limit (float or None): The number of seconds after which no new depth is started, or None to search straight to the depth.
+    table (TranspositionTable or None): The transposition table of the search, shared by all the depths.
+
+    Returns:
+    (float, Move, int): The evaluation, the best move and the depth reached.
+    """
+    if time_limit is None:
+        return minimax(board, depth, color == BLACK, None, table=table) + (depth,)
+
+    start = time.perf_counter()
+    result = None
+    for current_depth in range(1, depth + 1):
+        result = minimax(board, current_depth, color == BLACK, None, table=table) + (current_depth,)
+        if time.perf_counter() - start >= time_limit:
+            break
+    return result
+
+def classify(drop, mistake=MISTAKE, blunder=BLUNDER):
+    """
+    Returns the flag of a move from the score it lost.
+
+    Parameters:
+    drop (float): The score lost by the played move compared to the best move, from the point of view of the player who moved.
+    mistake (float): The score drop from which a move is a mistake.
+    blunder (float): The score drop from which a move is a blunder.
+
+    Returns:
+    str or None: 'blunder', 'mistake', or None for a good move.
+    """
+    if drop >= blunder:
+        return 'blunder'
+    if drop >= mistake:
+        return 'mistake'
+    return None
+
+def analyze_position(task):
+    """
+    Analyzes one move of a game. Runs in the worker processes, so it only takes and returns plain data.
+
+    Parameters:
+    task (tuple): The number of the game, the moves of the game as returned by Move.to_list, the index of the move to analyze, the depth, the time limit, and the mistake and blunder thresholds.
+
+    Returns:
+    dict: The annotation of the move.
+    """
+    game_number, moves, ply, depth, time_limit, mistake, blunder = task
+    board = Gameboard()
+    for move in moves[:ply]:
+        board.make_move(Move.from_list(move))
+    color = WHITE if ply % 2 == 0 else BLACK
+    played = Move.from_list(moves[ply])
+
+    table = TranspositionTable()
+    best_score, best_move, reached = search(board, color, depth, time_limit, table)
+    best_score = finite_score(best_score)
+
+    # Score the played move at the same depth as the best move, reusing what the search found about it
+    undo = board.make_move(played)
+    played_score = finite_score(minimax(board, reached - 1, color != BLACK, None, table=table)[0])
+    board.undo_move(played, undo)
+
+    # The evaluation is from black's point of view, so white loses score when it goes up. Both scores are finite, so two lost positions give no drop
+    drop = best_score - played_score if color == BLACK else played_score - best_score
+    drop = max(drop, 0)
+    return {
+        'game': game_number,
+        'ply': ply,
+        'color': 'BLACK' if color == BLACK else 'WHITE',
+        'played': played.to_list(),
+        'best': best_move.to_list() if best_move is not None else None,
+        'best_score': best_score,
+        'played_score': played_score,
+        'drop': drop,
+        'depth': reached,
+        'flag': classify(drop, mistake, blunder),
+    }
+
+def read_checkpoint(path):
+    """
+    Returns the moves already analyzed in an output file. A last line left incomplete by an interruption is cut off the file, so new annotations are appended on a line of their own.
+
+    Parameters:
+    path (str): The path of the output file.
+
+    Returns:
+    set: A set of (game number, ply) tuples.
+    """
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, 'rb+') as file:
+        # Step back from the end in blocks until the last newline, without reading the whole file
+        end = file.seek(0, os.SEEK_END)
+        position = end
+        while position > 0:
+            start = max(position - CHECKPOINT_BLOCK, 0)
+            file.seek(start)
+            newline = file.read(position - start).rfind(b'\n')
+            if newline != -1:
+                position = start + newline + 1
+                break
+            position = start
+        if position != end:
+            file.truncate(position)
+    with open(path) as file:
+        for line in file:
+            try:
+                annotation = json.loads(line)
+            except ValueError:
+                continue
+            done.add((annotation['game'], annotation['ply']))
+    return done
+
+def iter_tasks(games_path, done, depth, time_limit, mistake, blunder):
+    """
+    Yields the analysis tasks of every move of every game that is not analyzed yet.
+
+    Parameters:
+    games_path (str): The path of the game records.
+    done (set): The (game number, ply) tuples already analyzed.
+    depth (int): The depth of the search.
+    time_limit (float or None): The time limit of the search of each position.
+    mistake (float): The score drop from which a move is a mistake.
+    blunder (float): The score drop from which a move is a blunder.
+
+    Yields:
+    tuple: The tasks taken by analyze_position.
+    """
+    for game_number, moves in load_games(games_path):
+        moves = [move.to_list() for move in moves]
+        for ply in range(len(moves)):
+            if (game_number, ply) not in done:
+                yield game_number, moves, ply, depth, time_limit, mistake, blunder
+
+def analyze_games(games_path, output_path, depth=4, time_limit=None, workers=None, mistake=MISTAKE, blunder=BLUNDER):
+    """
+    Analyzes every move of the stored games with a pool of processes, and appends the annotations to the output file as soon as they are ready.
+
+    Parameters:
+    games_path (str): The path of the game records.
+    output_path (str): The path of the output file, which is also the checkpoint of the analysis.
+    depth (int): The depth of the search. Default is 4, the same as in play.
+    time_limit (float or None): The time limit of the search of each position. Default is None.
+    workers (int or None): The number of processes, or None for one per CPU.
+    mistake (float): The score drop from which a move is a mistake.
+    blunder (float): The score drop from which a move is a blunder.
+
+    Returns:
+    int: The number of moves analyzed by this run.
+    """
+    done = read_checkpoint(output_path)
+    tasks = iter_tasks(games_path, done, depth, time_limit, mistake, blunder)
+    count = 0
+    with Pool(workers) as pool, open(output_path, 'a') as output:
+        for annotation in pool.imap(analyze_position, tasks, chunksize=4):
+            output.write(json.dumps(annotation, allow_nan=False) + '\n')
+            output.flush()
+            count += 1
+            if annotation['flag']:
+                print(f"game {annotation['game']} ply {annotation['ply']}: {annotation['flag']} {Move.from_list(annotation['played'])}, best {Move.from_list(annotation['best'])}, drop {annotation['drop']}")
+    return count
+
+def main(argv=None):
+    """
+    Runs the analysis from the command line.
+    """
+    parser = argparse.ArgumentParser(description='Annotate stored games with the best moves, score drops and blunders.')
+    parser.add_argument('games', help='file of game records saved by the game, one JSON record per line')
+    parser.add_argument('--output', default='analysis.jsonl', help='file the annotations are appended to, also used to resume')
+    parser.add_argument('--depth', type=int, default=4, help='depth of the search, or maximum depth with --time')
+    parser.add_argument('--time', type=float, default=None, help='seconds after which no new search depth is started for a position')
+    parser.add_argument('--workers', type=int, default=None, help='number of processes, one per CPU by default')
+    parser.add_argument('--mistake', type=float, default=MISTAKE, help='score drop from which a move is a mistake')
+    parser.add_argument('--blunder', type=float, default=BLUNDER, help='score drop from which a move is a blunder')
+    args = parser.parse_args(argv)
+
+    count = analyze_games(args.games, args.output, args.depth, args.time, args.workers, args.mistake, args.blunder)
+    print(f"Analyzed {count} moves.")
+
+
+if __name__ == '__main__':
+    main()
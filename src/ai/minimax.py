@@ -1,25 +1,41 @@
-import pygame
-from copy import deepcopy
 from ..core.constants import BLACK,WHITE
-pygame.mixer.init()
-jump_sound = pygame.mixer.Sound("src/sounds/jump_sound.wav")
+from .transposition import EXACT, LOWER, UPPER
 
-def minimax(position, depth, max_player, game):
+def minimax(position, depth, max_player, game, alpha=float('-inf'), beta=float('inf'), table=None):
     """
-    Returns the best move and its evaluation for a given position, depth, and player using the minimax algorithm.
+    Returns the best move and its evaluation for a given position, depth, and player using the minimax algorithm with alpha-beta pruning.
+    The moves are played and taken back on the position itself, so it is left unchanged when the search returns.
+    Moves are generated lazily, so the ones after a cutoff are never generated.
+    With a transposition table, positions already searched deep enough (or their mirrors) are not searched again, and the best move found before is tried first.
 
     Parameters:
     position (Board): The current board state.
     depth (int): The depth of the search tree.
     max_player (bool): True if the player is maximizing, False if minimizing.
     game (Game): The game object.
+    alpha (float): The score the maximizing player is already assured of. Default is minus infinity.
+    beta (float): The score the minimizing player is already assured of. Default is infinity.
+    table (TranspositionTable or None): The table to cache the results in. Default is None, for no cache.
 
     Returns:
-    (int, Board): A tuple of the evaluation and the best move for the position.
+    (int, Move): A tuple of the evaluation and the best move for the position, or None as the move if there is no move to make.
     """
     # Base case: the game is over or the depth limit is reached
     if depth == 0 or position.winner() != None:
-        return position.evaluate(), position
+        return position.evaluate(), None
+
+    # Use the result of an earlier search of the position if it is deep enough and decides the score
+    key = None
+    first_move = None
+    if table is not None and depth >= table.MIN_DEPTH:
+        key = table.key(position, BLACK if max_player else WHITE)
+        entry = table.get(key)
+        if entry is not None:
+            entry_depth, score, bound, first_move = entry
+            if entry_depth >= depth:
+                if bound == EXACT or (bound == LOWER and score >= beta) or (bound == UPPER and score <= alpha):
+                    return score, first_move
+    alpha_start, beta_start = alpha, beta
     
     # Recursive case: explore the possible moves
     if max_player:
@@ -27,13 +43,20 @@ def minimax(position, depth, max_player, game):
         maxEval = float('-inf')
         best_move = None
         # Loop through all the possible moves for the AI
-        for move in get_all_moves(position, BLACK, game):
-            # Recursively call minimax on the resulting position, switching the player and decreasing the depth
-            evaluation = minimax(move, depth-1, False, game)[0]
-            # Update the best value and move if the current evaluation is higher
-            maxEval = max(maxEval, evaluation)
-            if maxEval == evaluation:
+        for move in order_moves(first_move, get_all_moves(position, BLACK, game)):
+            # Play the move, recursively call minimax on the resulting position, switching the player and decreasing the depth, then take the move back
+            undo = position.make_move(move)
+            evaluation = minimax(position, depth-1, False, game, alpha, beta, table)[0]
+            position.undo_move(move, undo)
+            # Update the best value and move if the current evaluation is higher, keeping a move even if they all lose
+            if evaluation > maxEval or best_move is None:
+                maxEval = evaluation
                 best_move = move
+            # Stop if the human already has a better option elsewhere in the tree
+            alpha = max(alpha, maxEval)
+            if alpha >= beta:
+                break
+        store(table, key, depth, maxEval, best_move, alpha_start, beta_start)
         # Return the best value and move for the AI
         return maxEval, best_move
     else:
@@ -41,59 +64,76 @@ def minimax(position, depth, max_player, game):
         minEval = float('inf')
         best_move = None
         # Loop through all the possible moves for the human
-        for move in get_all_moves(position, WHITE, game):
-            # Recursively call minimax on the resulting position, switching the player and decreasing the depth
-            evaluation = minimax(move, depth-1, True, game)[0]
-            # Update the best value and move if the current evaluation is lower
-            minEval = min(minEval, evaluation)
-            if minEval == evaluation:
+        for move in order_moves(first_move, get_all_moves(position, WHITE, game)):
+            # Play the move, recursively call minimax on the resulting position, switching the player and decreasing the depth, then take the move back
+            undo = position.make_move(move)
+            evaluation = minimax(position, depth-1, True, game, alpha, beta, table)[0]
+            position.undo_move(move, undo)
+            # Update the best value and move if the current evaluation is lower, keeping a move even if they all lose
+            if evaluation < minEval or best_move is None:
+                minEval = evaluation
                 best_move = move
+            # Stop if the AI already has a better option elsewhere in the tree
+            beta = min(beta, minEval)
+            if alpha >= beta:
+                break
+        store(table, key, depth, minEval, best_move, alpha_start, beta_start)
         # Return the best value and move for the human
         return minEval, best_move
 
 
-def simulate_move(piece, move, board, game, skip):
+def get_all_moves(board, color, game):
     """
-    Simulates a move on a board and returns the resulting board.
+    Returns an iterator over all possible moves for a given board, color, and game. The moves are generated lazily, captures first.
 
     Parameters:
-    piece (Piece): The piece to move.
-    move (tuple): The coordinates of the destination square.
-    board (Board): The board to move on.
+    board (Board): The board to get moves from.
+    color (int): The color of the pieces to move.
     game (Game): The game object.
-    skip (Piece or None): The piece to skip over if any.
 
     Returns:
-    Board: The board after the move is made.
+    iterator: An iterator of Move objects representing the possible moves.
     """
-    board.move(piece, move[0], move[1])
-    if skip:
-        board.remove(skip)
+    return board.iter_moves(color)
 
-    return board
 
-
-def get_all_moves(board, color, game):
+def order_moves(first_move, moves):
     """
-    Returns a list of all possible moves for a given board, color, and game.
+    Yields a move first, then the other moves without it.
 
     Parameters:
-    board (Board): The board to get moves from.
-    color (int): The color of the pieces to move.
-    game (Game): The game object.
+    first_move (Move or None): The move to try first, e.g. the best move of an earlier search, or None to keep the order of the moves.
+    moves (iterator): The moves of the position.
 
-    Returns:
-    list: A list of boards representing the possible moves.
+    Yields:
+    Move: The moves of the position.
     """
-    moves = []
+    if first_move is not None:
+        yield first_move
+    for move in moves:
+        if move != first_move:
+            yield move
 
-    for piece in board.get_all_pieces(color):
-        valid_moves = board.get_valid_moves(piece)
-        for move, skip in valid_moves.items():
-            temp_board = deepcopy(board)
-            temp_piece = temp_board.get_piece(piece.row, piece.col)
-            new_board = simulate_move(temp_piece, move, temp_board, game, skip)
-            moves.append(new_board)
-    
-    return moves
 
+def store(table, key, depth, score, best_move, alpha, beta):
+    """
+    Stores the result of a search in a transposition table. A score outside the search window is only a bound on the real score.
+
+    Parameters:
+    table (TranspositionTable or None): The table, or None to store nothing.
+    key (tuple or None): The key of the position in the table, or None if the position is not cached.
+    depth (int): The depth searched.
+    score (float): The score found.
+    best_move (Move or None): The best move found.
+    alpha (float): The alpha the search of the position started with.
+    beta (float): The beta the search of the position started with.
+    """
+    if key is None:
+        return
+    if score <= alpha:
+        bound = UPPER
+    elif score >= beta:
+        bound = LOWER
+    else:
+        bound = EXACT
+    table.put(key, depth, score, bound, best_move)
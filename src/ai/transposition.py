@@ -0,0 +1,127 @@
+from ..core.symmetry import EMPTY, canonical_key, position_key, mirror_move
+
+EXACT, LOWER, UPPER = 0, 1, 2
+
+class TranspositionTable:
+    """
+    A class that caches minimax results by position, so a position reached again (by another move order, as the mirror of a position
+    already searched, or in the search of a later turn) is not searched twice. Positions are keyed by their canonical form, and results
+    of a mirrored position are stored and returned with the score negated, the bounds swapped and the move mirrored.
+
+    Attributes:
+    entries (dict): Maps a canonical key to a (depth, score, bound, move) tuple.
+    size (int): The maximum number of entries. The entry stored least recently is dropped when a new one does not fit.
+    canonical (bool): True to key positions by their canonical form, False to key them as they are (only useful to measure what the canonical form saves).
+    hits (int): The number of lookups that found an entry.
+    lookups (int): The number of lookups.
+    MIN_DEPTH (int): The smallest depth left for which positions are cached. Shallower positions are cheaper to search than to look up.
+    """
+    MIN_DEPTH = 2
+
+    def __init__(self, size=200000, canonical=True):
+        """
+        Initializes an empty table that holds at most size entries.
+        """
+        self.entries = {}
+        self.size = size
+        self.canonical = canonical
+        self.hits = 0
+        self.lookups = 0
+
+    def key(self, board, color):
+        """
+        Returns the key to use with get and put for a position.
+
+        Parameters:
+        board (Gameboard): The position.
+        color (int): The color of the player to move (WHITE or BLACK).
+
+        Returns:
+        (bytes, bool): The canonical key and whether the position is mirrored, as returned by canonical_key.
+        """
+        if not self.canonical:
+            return position_key(board, color), False
+        return canonical_key(board, color)
+
+    def get(self, key):
+        """
+        Returns the entry of a position, in the orientation of the position.
+
+        Parameters:
+        key (tuple): The key returned by the key method.
+
+        Returns:
+        (int, float, int, Move) or None: The depth searched, the score, whether the score is EXACT, a LOWER bound or an UPPER bound, and the best move; or None if the position is not in the table.
+        """
+        self.lookups += 1
+        canonical, mirrored = key
+        entry = self.entries.get(canonical)
+        if entry is None:
+            return None
+        self.hits += 1
+        if not mirrored:
+            return entry
+        depth, score, bound, move = entry
+        return depth, -score, _swap_bound(bound), mirror_move(move) if move is not None else None
+
+    def put(self, key, depth, score, bound, move):
+        """
+        Stores the result of a search of a position, given in the orientation of the position.
+
+        Parameters:
+        key (tuple): The key returned by the key method.
+        depth (int): The depth searched.
+        score (float): The score found.
+        bound (int): EXACT, LOWER or UPPER.
+        move (Move or None): The best move found.
+        """
+        canonical, mirrored = key
+        if mirrored:
+            score, bound = -score, _swap_bound(bound)
+            move = mirror_move(move) if move is not None else None
+        # Storing a position again moves it to the end, so the entries refreshed every turn are the last ones dropped
+        if self.entries.pop(canonical, None) is None and len(self.entries) >= self.size:
+            del self.entries[next(iter(self.entries))]
+        self.entries[canonical] = (depth, score, bound, move)
+
+    def prune(self, board):
+        """
+        Removes the entries of positions with more pieces than a board. Captured pieces never come back (except when a move is undone, which only makes the next search slower), so those positions cannot be reached any more from it.
+
+        Parameters:
+        board (Gameboard): The current board.
+        """
+        pieces = board.black_left + board.white_left
+        # A key has one byte for the player to move and one for each dark square
+        self.entries = {key: entry for key, entry in self.entries.items() if len(key) - 1 - key.count(EMPTY) <= pieces}
+
+    def hit_rate(self):
+        """
+        Returns the share of lookups that found an entry, between 0 and 1.
+        """
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    def clear(self):
+        """
+        Removes every entry and resets the counters.
+        """
+        self.entries.clear()
+        self.hits = 0
+        self.lookups = 0
+
+    def __len__(self):
+        """
+        Returns the number of entries.
+        """
+        return len(self.entries)
+
+
+def _swap_bound(bound):
+    """
+    Returns the bound of a negated score: a lower bound becomes an upper bound and the other way round.
+    """
+    if bound == LOWER:
+        return UPPER
+    if bound == UPPER:
+        return LOWER
+    return bound
@@ -0,0 +1,144 @@
+import math
+import time
+from collections import deque
+from contextlib import contextmanager
+import pygame
+from .constants import WHITE
+from .resources import resources
+
+class FrameStats:
+    """
+    A class that measures how long every frame takes and how that time is split between the sections of the game loop (e.g. AI, draw and event handling).
+    Only the last frames are kept, so the memory used stays the same however long the game runs.
+
+    Attributes:
+    frames (deque): The duration in seconds of the last recorded frames.
+    sections (dict): Maps the name of each section to a deque of its duration in seconds for the last recorded frames.
+    log_every (int): The number of frames between two printed summaries, or 0 to never print them.
+    frame_count (int): The number of frames recorded since the object was created.
+    """
+    FONT_SIZE = 24
+    MARGIN = 8
+
+    def __init__(self, size=600, log_every=0):
+        """
+        Initializes the frame statistics with the number of frames to keep and how often to print a summary.
+        """
+        self.frames = deque(maxlen=size)
+        self.sections = {}
+        self.log_every = log_every
+        self.frame_count = 0
+        self._frame_start = None
+        self._current = {}
+
+    def begin_frame(self):
+        """
+        Starts measuring a new frame.
+        """
+        self._frame_start = time.perf_counter()
+        self._current = {}
+
+    @contextmanager
+    def section(self, name):
+        """
+        Measures the time spent in the body of a with statement and adds it to the named section of the current frame.
+
+        Parameters:
+        name (str): The name of the section, e.g. 'ai', 'draw' or 'events'.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._current[name] = self._current.get(name, 0.0) + time.perf_counter() - start
+
+    def end_frame(self):
+        """
+        Stops measuring the current frame and records its duration and the duration of its sections. Prints a summary every log_every frames.
+        """
+        if self._frame_start is None:
+            return
+        self.frames.append(time.perf_counter() - self._frame_start)
+        for name, duration in self._current.items():
+            if name not in self.sections:
+                self.sections[name] = deque(maxlen=self.frames.maxlen)
+            self.sections[name].append(duration)
+        for name, durations in self.sections.items():
+            if name not in self._current:
+                durations.append(0.0)
+        self._frame_start = None
+        self.frame_count += 1
+
+        if self.log_every and self.frame_count % self.log_every == 0:
+            print(self.format_summary())
+
+    @staticmethod
+    def percentile(samples, percent):
+        """
+        Returns the given percentile of a list of samples, using the nearest-rank method.
+
+        Parameters:
+        samples (iterable): The samples to get the percentile of.
+        percent (float): The percentile to get, between 0 and 100.
+
+        Returns:
+        float: The percentile of the samples, or 0.0 if there are no samples.
+        """
+        ordered = sorted(samples)
+        if not ordered:
+            return 0.0
+        rank = max(math.ceil(percent / 100 * len(ordered)) - 1, 0)
+        return ordered[min(rank, len(ordered) - 1)]
+
+    def summary(self):
+        """
+        Returns the frame time percentiles and the mean time of every section, in milliseconds.
+
+        Returns:
+        dict: A dictionary with the 'frames', 'p50', 'p95' and 'p99' keys, and a 'sections' dictionary that maps every section name to its mean time.
+        """
+        frames = list(self.frames)
+        return {
+            'frames': len(frames),
+            'p50': self.percentile(frames, 50) * 1000,
+            'p95': self.percentile(frames, 95) * 1000,
+            'p99': self.percentile(frames, 99) * 1000,
+            'sections': {name: sum(durations) / len(durations) * 1000 for name, durations in self.sections.items() if durations},
+        }
+
+    def format_summary(self):
+        """
+        Returns the summary as a single line of text.
+
+        Returns:
+        str: The frame time percentiles and the mean time of every section.
+        """
+        summary = self.summary()
+        text = f"frame p50 {summary['p50']:.2f} ms, p95 {summary['p95']:.2f} ms, p99 {summary['p99']:.2f} ms"
+        for name, mean in summary['sections'].items():
+            text += f", {name} {mean:.2f} ms"
+        return text
+
+    def draw(self, window):
+        """
+        Draws the summary in the top left corner of the window, one value per line.
+
+        Parameters:
+        window (pygame.Surface): The window to draw the summary on.
+        """
+        summary = self.summary()
+        lines = [f"p50 {summary['p50']:.2f} ms", f"p95 {summary['p95']:.2f} ms", f"p99 {summary['p99']:.2f} ms"]
+        lines += [f"{name} {mean:.2f} ms" for name, mean in summary['sections'].items()]
+
+        font = resources.font(self.FONT_SIZE)
+        surfaces = [font.render(line, True, WHITE) for line in lines]
+        width = max(surface.get_width() for surface in surfaces) + 2 * self.MARGIN
+        height = sum(surface.get_height() for surface in surfaces) + 2 * self.MARGIN
+        background = pygame.Surface((width, height), pygame.SRCALPHA)
+        background.fill((0, 0, 0, 160))
+        window.blit(background, (0, 0))
+
+        y = self.MARGIN
+        for surface in surfaces:
+            window.blit(surface, (self.MARGIN, y))
+            y += surface.get_height()
@@ -1,9 +1,9 @@
 import pygame
 from .constants import BLACK, WHITE, BLUE, SQUARE_SIZE, LIGHT_BEIGE
 from .gameboard import Gameboard
+from .history import MoveHistory
+from .resources import resources
 import math
-pygame.mixer.init()
-jump_sound = pygame.mixer.Sound("src/sounds/jump_sound.wav")
 
 class Game:
     """
@@ -16,6 +16,7 @@ class Game:
     turn (int): The color of the player whose turn it is (WHITE or BLACK).
     valid_moves (dict): A dictionary that maps the coordinates of the valid moves to the pieces that can be skipped by making that move.
     winner_moves (str or None): The winner of the game, or None if there is no winner yet.
+    history (MoveHistory): The moves played so far, which can be undone and redone.
     """
     def __init__(self, window):
         """
@@ -33,16 +34,22 @@ class Game:
         self.turn = WHITE
         self.valid_moves = {}
         self.winner_moves = None
+        self.history = MoveHistory()
 
-        
 
     def update(self):
         """
         Updates the game display by drawing the gameboard and the valid moves on the window.
         """
+        self.draw()
+        pygame.display.update()
+
+    def draw(self):
+        """
+        Draws the gameboard and the valid moves on the window without updating the display, so more can be drawn on top of them.
+        """
         self.gameboard.draw(self.window)
         self.draw_valid_moves(self.valid_moves)
-        pygame.display.update()
 
     def reset(self):
         """
@@ -90,29 +97,56 @@ class Game:
         winner_moves: opposite color if current player does not have any valid moves
         bool: True if the move was successful, False otherwise.
         """
-        remaining_pieces = self.gameboard.get_all_pieces(self.turn)
-        any_valid_moves = False # initialize a variable to store if there are any valid moves
-        for piece in remaining_pieces:
-            valid_moves = self.gameboard.get_valid_moves(piece) # use a different variable name than valid_moves_pieces
-            if valid_moves:
-                print(f"{self.turn} piece at ({piece.row}, {piece.col}) has valid moves: {valid_moves}")
-                any_valid_moves = True # set the variable to True if there is at least one valid move
-
-        if not any_valid_moves: # use the variable to check if there are no valid moves
+        if not self.gameboard.has_moves(self.turn): # stops at the first valid move found
             self.winner_moves = 'WHITE' if self.turn == BLACK else 'BLACK'         
             print("No valid moves for any pieces. Game over.")
 
         piece = self.gameboard.get_piece(row, col)
         if self.selected_piece and piece == 0 and (row, col) in self.valid_moves:
-            self.gameboard.move(self.selected_piece, row, col)
             skipped = self.valid_moves[(row, col)]
-            if skipped:
-                self.gameboard.remove(skipped)
-            self.change_turn()                  
+            self.play_move(self.gameboard.build_move(self.selected_piece, row, col, skipped))
         else:
             return False
-        jump_sound.play()
         return True
+
+    def play_move(self, move):
+        """
+        Plays a move on the gameboard, records it in the move history, changes the turn and plays a sound.
+
+        Parameters:
+        move (Move): The move to play.
+        """
+        self.history.push(move, self.gameboard.make_move(move))
+        self.selected_piece = None
+        self.change_turn()
+        resources.sound('jump_sound.wav').play()
+
+    def undo(self):
+        """
+        Takes back the last played move and gives the turn back to the player who made it.
+
+        Returns:
+        Move or None: The move that was taken back, or None if there is nothing to undo.
+        """
+        move = self.history.undo(self.gameboard)
+        if move is not None:
+            self.selected_piece = None
+            self.winner_moves = None
+            self.change_turn()
+        return move
+
+    def redo(self):
+        """
+        Plays again the last move that was taken back.
+
+        Returns:
+        Move or None: The move that was played again, or None if there is nothing to redo.
+        """
+        move = self.history.redo(self.gameboard)
+        if move is not None:
+            self.selected_piece = None
+            self.change_turn()
+        return move
     
     def change_turn(self):
         """
@@ -134,15 +168,17 @@ class Game:
         Parameters:
         moves (dict): A dictionary that maps the coordinates of the valid moves to the pieces that can be skipped by making that move.
         """
+        if not moves:
+            return
+        radius = 15
+
+        # Calculate pulsating effect, which is the same for every circle of the frame
+        pulsate_factor = math.sin(pygame.time.get_ticks() * 0.005)
+        pulsate_radius = int(radius + radius * 0.1 * pulsate_factor)
+
         for move in moves:
             row, col = move
             center = (col * SQUARE_SIZE + SQUARE_SIZE // 2, row * SQUARE_SIZE + SQUARE_SIZE // 2)
-            radius = 15
-
-            # Calculate pulsating effect
-            pulsate_factor = math.sin(pygame.time.get_ticks() * 0.005)
-            pulsate_radius = int(radius + radius * 0.1 * pulsate_factor)
-
             pygame.draw.circle(self.window, LIGHT_BEIGE, center, pulsate_radius)
 
     def winner(self):
@@ -158,16 +194,18 @@ class Game:
         return self.gameboard.winner()
     
 
-    def ai_move(self, gameboard):
+    def ai_move(self, move):
         """
-        Makes a move for the AI by updating the gameboard, changing the turn, and playing a sound.
+        Makes a move for the AI by playing it on the gameboard, changing the turn, and playing a sound.
+        If the AI has no move to make, the opposite color wins.
 
         Parameters:
-        gameboard (Gameboard): The gameboard object that represents the AI's move.
+        move (Move or None): The move chosen by the AI, or None if it has no valid moves.
         """
-        self.gameboard = gameboard
-        self.change_turn()
-        jump_sound.play()
+        if move is None:
+            self.winner_moves = 'WHITE' if self.turn == BLACK else 'BLACK'
+            return
+        self.play_move(move)
 
 
     def get_board(self):
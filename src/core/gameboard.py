@@ -1,6 +1,8 @@
 import pygame
-from .constants import DARK, LIGHT, BLACK, WHITE, ROWS, COLS, SQUARE_SIZE
+from .constants import DARK, LIGHT, BLACK, WHITE, ROWS, COLS, SQUARE_SIZE, WIDTH, HEIGHT
 from .piece import Piece
+from .move import Move
+from .resources import resources
 
 class Gameboard:
     """
@@ -25,15 +27,27 @@ class Gameboard:
 
     def draw_squares(self, window):
         """
-        Draws the light and dark squares on the window to create the board.
+        Draws the light and dark squares on the window to create the board. The squares are rendered once and reused.
 
         Parameters:
         window (pygame.Surface): The window to draw the squares on.
         """
-        window.fill(DARK)
+        window.blit(resources.surface('board', Gameboard.render_squares), (0, 0))
+
+    @staticmethod
+    def render_squares():
+        """
+        Renders the light and dark squares of the board on a new surface.
+
+        Returns:
+        pygame.Surface: The surface with the squares.
+        """
+        surface = pygame.Surface((WIDTH, HEIGHT))
+        surface.fill(DARK)
         for row in range(ROWS):
             for col in range(row % 2, COLS, 2):
-                pygame.draw.rect(window, LIGHT, (row * SQUARE_SIZE, col * SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE))
+                pygame.draw.rect(surface, LIGHT, (row * SQUARE_SIZE, col * SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE))
+        return surface
 
     def create_board(self):
         """
@@ -71,6 +85,79 @@ class Gameboard:
             elif piece.color == BLACK and not piece.is_king():
                 self.black_kings += 1
 
+    def make_move(self, move):
+        """
+        Plays a move on the board in place: moves the piece to the end of the move's path and removes the captured pieces.
+        Returns the information needed to take the move back with undo_move, so no copy of the board is made.
+
+        Parameters:
+        move (Move): The move to play.
+
+        Returns:
+        tuple: The undo information (captured pieces, whether the piece was crowned, and the previous king counts).
+        """
+        start_row, start_col = move.start
+        piece = self.gameboard[start_row][start_col]
+        was_king = piece.king
+        black_kings, white_kings = self.black_kings, self.white_kings
+        captured = [self.gameboard[row][col] for row, col in move.captured]
+
+        self.remove(captured)
+        end_row, end_col = move.end
+        self.move(piece, end_row, end_col)
+
+        return captured, piece.king and not was_king, black_kings, white_kings
+
+    def undo_move(self, move, undo):
+        """
+        Takes back a move previously played with make_move: moves the piece back to its start square, uncrowns it if the move crowned it, and puts the captured pieces back.
+
+        Parameters:
+        move (Move): The move to take back.
+        undo (tuple): The undo information returned by make_move for that move.
+        """
+        captured, promoted, black_kings, white_kings = undo
+        end_row, end_col = move.end
+        start_row, start_col = move.start
+        piece = self.gameboard[end_row][end_col]
+        self.gameboard[end_row][end_col] = 0
+        self.gameboard[start_row][start_col] = piece
+        piece.move(start_row, start_col)
+        if promoted:
+            piece.king = False
+
+        for captured_piece in captured:
+            self.gameboard[captured_piece.row][captured_piece.col] = captured_piece
+            if captured_piece.color == WHITE:
+                self.white_left += 1
+            else:
+                self.black_left += 1
+        self.black_kings = black_kings
+        self.white_kings = white_kings
+
+    def build_move(self, piece, row, col, skipped):
+        """
+        Builds a Move object for a piece going to a destination square over the given skipped pieces, as found in the dictionary returned by get_valid_moves.
+        The landing squares of a multi-jump are rebuilt from the skipped pieces, which get_valid_moves lists from the last one captured to the first one.
+
+        Parameters:
+        piece (Piece): The piece that moves.
+        row (int): The row index of the destination square.
+        col (int): The column index of the destination square.
+        skipped (list): The list of pieces that are skipped by the move.
+
+        Returns:
+        Move: The move of the piece.
+        """
+        if not skipped:
+            return Move((piece.row, piece.col), [(row, col)])
+
+        path = []
+        current_row, current_col = piece.row, piece.col
+        for skipped_piece in reversed(skipped):
+            current_row, current_col = 2 * skipped_piece.row - current_row, 2 * skipped_piece.col - current_col
+            path.append((current_row, current_col))
+        return Move((piece.row, piece.col), path, [(skipped_piece.row, skipped_piece.col) for skipped_piece in reversed(skipped)])
 
     def get_piece(self, row, col):
         """
@@ -103,8 +190,8 @@ class Gameboard:
     def get_valid_moves(self, piece):
         """
         Returns a dictionary of valid moves for a given piece on the board. The keys are the coordinates of the destination squares, and the values are the lists of 
-        pieces that can be skipped by making that move. A move is valid if it is diagonal, within the board boundaries, and either empty or occupied by an enemy 
-        piece that can be skipped.
+        pieces that can be skipped by making that move, from the last one captured to the first one. A move is valid if it is diagonal, within the board boundaries, 
+        and either empty or occupied by an enemy piece that can be skipped.
 
         Parameters:
         piece (Piece): The piece to get the valid moves for.
@@ -113,127 +200,123 @@ class Gameboard:
         dict: A dictionary of valid moves for the piece.
         """
         moves = {}
-        left = piece.col - 1
-        right = piece.col + 1
-        row = piece.row
-        if piece.color == WHITE or piece.king:
-            moves.update(self._traverse_left(row - 1, max(row - 3, -1), -1, piece.color, left))
-            moves.update(self._traverse_right(row - 1, max(row - 3, -1), -1, piece.color, right))
-        if piece.color == BLACK or piece.king:
-            moves.update(self._traverse_left(row + 1, min(row + 3, ROWS), 1, piece.color, left))
-            moves.update(self._traverse_right(row + 1, min(row + 3, ROWS), 1, piece.color, right))
+        for move in self.iter_piece_moves(piece):
+            moves[move.end] = [self.gameboard[row][col] for row, col in reversed(move.captured)]
 
         return moves
-    
 
-    def _traverse_left(self, start, stop, step, color, left, skipped=[]):
+    def iter_moves(self, color):
         """
-        Traverses the board diagonally to the left from a given start row and column, and returns a dictionary of valid moves along that direction. The traversal stops when it reaches the stop row, the left edge of the board, or a friendly piece. If an enemy piece is encountered, it can be skipped if the next square is empty, and the traversal continues with the skipped piece added to the list of skipped pieces.
+        Yields every valid move of the pieces of a given color, lazily and in stages: first the captures of every piece, including each step of the multi-jump chains, then the quiet moves.
+        Nothing is computed before a move is asked for, so a caller that stops early (e.g. a pruned search, or a check for any move at all) does not pay for the rest.
+        The board may be changed between two moves as long as it is restored before asking for the next one, as done by minimax with make_move and undo_move.
 
         Parameters:
-        start (int): The start row index of the traversal.
-        stop (int): The stop row index of the traversal.
-        step (int): The step size of the traversal (-1 for up, 1 for down).
-        color (int): The color of the piece that is moving (WHITE or BLACK).
-        left (int): The start column index of the traversal.
-        skipped (list): The list of pieces that have been skipped so far. Default is an empty list.
+        color (int): The color of the pieces to move (WHITE or BLACK).
 
-        Returns:
-        dict: A dictionary of valid moves along the left diagonal direction.
+        Yields:
+        Move: The valid moves of the pieces.
         """
-        moves = {}
-        last = []
-        # Loop through the rows from start to stop with the given step
-        for row_ in range(start, stop, step):
-            # If the column index is out of bounds, break the loop
-            if left < 0:
-                break
-            
-            # Get the piece or 0 at the current row and column
-            current = self.gameboard[row_][left]
-            # If the current square is empty
-            if current == 0:
-                if skipped and not last: # If there are skipped pieces but no last piece, break the loop
-                    break
-                elif skipped: # If there are skipped pieces and a last piece
-                    moves[(row_, left)] = last + skipped # Add the move to the dictionary with the last and skipped pieces as the value
-                else: # If there are no skipped pieces
-                    moves[(row_, left)] = last # Add the move to the dictionary with the last piece as the value
-                
-                if last: # If there is a last piece
-                    if step == -1: # If the step is -1 (moving up)
-                        row = max(row_ - 3, -1) # Set the stop row to the maximum of the current row minus 3 and -1
-                    else: # If the step is 1 (moving down)
-                        row = min(row_ + 3, ROWS) # Set the stop row to the minimum of the current row plus 3 and the number of rows
-
-                    if skipped: # If there are skipped pieces recursively traverse left and right from the next row with the last and skipped pieces as the skipped list
-                        moves.update(self._traverse_left(row_ + step, row, step, color, left - 1, skipped=last+skipped))
-                        moves.update(self._traverse_right(row_ + step, row, step, color, left + 1, skipped=last+skipped))
-                    else: # If there are no skipped pieces recursively traverse left and right from the next row with the last piece as the skipped list
-                        moves.update(self._traverse_left(row_ + step, row, step, color, left - 1, skipped=last))
-                        moves.update(self._traverse_right(row_ + step, row, step, color, left + 1, skipped=last))
-
-                break # Break the loop after adding the move
-            elif current.color == color: # If the current square is occupied by a friendly piece, break the loop
-                break
-            else: # If the current square is occupied by an enemy piece
-                last = [current] # Set the last piece to the current piece
-
-            left -= 1 # Decrease the column index by 1
-
-        return moves # Return the dictionary of valid moves
-
-    def _traverse_right(self, start, stop, step, color, right, skipped=[]):
-        """
-        Traverses the board diagonally to the right from a given start row and column, and returns a dictionary of valid moves along that direction. The traversal stops when it reaches the stop row, the right edge of the board, or a friendly piece. If an enemy piece is encountered, it can be skipped if the next square is empty, and the traversal continues with the skipped piece added to the list of skipped pieces.
+        pieces = self.get_all_pieces(color)
+        for piece in pieces:
+            yield from self._iter_captures(piece)
+        for piece in pieces:
+            yield from self._iter_quiet_moves(piece)
+
+    def iter_piece_moves(self, piece):
+        """
+        Yields every valid move of a given piece, captures first and quiet moves second.
+
+        Parameters:
+        piece (Piece): The piece to get the moves for.
+
+        Yields:
+        Move: The valid moves of the piece.
+        """
+        yield from self._iter_captures(piece)
+        yield from self._iter_quiet_moves(piece)
+
+    def has_moves(self, color) -> bool:
+        """
+        Returns True if a piece of the given color has at least one valid move, False otherwise. Stops at the first move found.
+        """
+        return next(self.iter_moves(color), None) is not None
+
+    def _directions(self, piece):
+        """
+        Returns the row steps a piece can move along: -1 (up) for white pieces, 1 (down) for black pieces, and both for kings.
+        """
+        if piece.king:
+            return (-1, 1)
+        return (-1,) if piece.color == WHITE else (1,)
+
+    def _iter_quiet_moves(self, piece):
+        """
+        Yields the moves of a piece to an empty diagonally adjacent square.
 
         Parameters:
-        start (int): The start row index of the traversal.
-        stop (int): The stop row index of the traversal.
-        step (int): The step size of the traversal (-1 for up, 1 for down).
+        piece (Piece): The piece to get the quiet moves for.
+
+        Yields:
+        Move: The quiet moves of the piece.
+        """
+        start = (piece.row, piece.col)
+        for step in self._directions(piece):
+            row = piece.row + step
+            if row < 0 or row >= ROWS:
+                continue
+            for col in (piece.col - 1, piece.col + 1):
+                if 0 <= col < COLS and self.gameboard[row][col] == 0:
+                    yield Move(start, ((row, col),))
+
+    def _iter_captures(self, piece):
+        """
+        Yields the captures of a piece, one move for every step of every multi-jump chain.
+
+        Parameters:
+        piece (Piece): The piece to get the captures for.
+
+        Yields:
+        Move: The captures of the piece.
+        """
+        start = (piece.row, piece.col)
+        for step in self._directions(piece):
+            yield from self._iter_jumps(start, piece.row, piece.col, step, piece.color, [], [])
+
+    def _iter_jumps(self, start, row, col, step, color, path, captured):
+        """
+        Yields the jumps over an enemy piece to the empty square right behind it from a given square, and recursively the jumps that continue the chain in the same row direction.
+        The path and captured lists are shared by the whole chain and restored before returning, so no list is copied until a move is yielded.
+
+        Parameters:
+        start (tuple): The square the moving piece starts from.
+        row (int): The row index of the square the chain continues from.
+        col (int): The column index of the square the chain continues from.
+        step (int): The row direction of the chain (-1 for up, 1 for down).
         color (int): The color of the piece that is moving (WHITE or BLACK).
-        right (int): The start column index of the traversal.
-        skipped (list): The list of pieces that have been skipped so far. Default is an empty list.
+        path (list): The landing squares of the chain so far.
+        captured (list): The captured squares of the chain so far.
 
-        Returns:
-        dict: A dictionary of valid moves along the right diagonal direction.
+        Yields:
+        Move: The jumps of the chain.
         """
-        moves = {}
-        last = []
-        for row_ in range(start, stop, step): # Loop through the rows from start to stop with the given step
-            if right >= COLS: # If the column index is out of bounds, break the loop
-                break
-            current = self.gameboard[row_][right] # Get the piece or 0 at the current row and column
-            if current == 0: # If the current square is empty
-                if skipped and not last:  # If there are skipped pieces but no last piece, break the loop
-                    break
-                elif skipped: # If there are skipped pieces and a last piece
-                    moves[(row_, right)] = last + skipped # Add the move to the dictionary with the last and skipped pieces as the value
-                else: # If there are no skipped pieces
-                    moves[(row_, right)] = last # Add the move to the dictionary with the last piece as the value
-                if last: # If there is a last piece
-                    if step == -1: # If the step is -1 (moving up)
-                        row = max(row_ - 3, -1) # Set the stop row to the maximum of the current row minus 3 and -1
-                    else: # If the step is 1 (moving down)
-                        row = min(row_ + 3, ROWS) # Set the stop row to the minimum of the current row plus 3 and the number of rows
-
-                    if skipped: # If there are skipped pieces recursively traverse left and right from the next row with the last and skipped pieces as the skipped list
-                        moves.update(self._traverse_left(row_ + step, row, step, color, right - 1, skipped=last+skipped))
-                        moves.update(self._traverse_right(row_ + step, row, step, color, right + 1, skipped=last+skipped))
-                    else: # If there are no skipped pieces recursively traverse left and right from the next row with the last piece as the skipped list
-                        moves.update(self._traverse_left(row_ + step, row, step, color, right - 1, skipped=last))
-                        moves.update(self._traverse_right(row_ + step, row, step, color, right + 1, skipped=last))
-
-                break # Break the loop after adding the move
-            elif current.color == color: # If the current square is occupied by a friendly piece, break the loop
-                break
-            else: # If the current square is occupied by an enemy piece
-                last = [current] # Set the last piece to the current piece
-                
-            right += 1 # Increase the column index by 1
-        
-        return moves # Return the dictionary of valid moves
-    
+        jump_row = row + 2 * step
+        if jump_row < 0 or jump_row >= ROWS:
+            return
+        for side in (-1, 1):
+            jump_col = col + 2 * side
+            if jump_col < 0 or jump_col >= COLS:
+                continue
+            current = self.gameboard[row + step][col + side]
+            if current == 0 or current.color == color or self.gameboard[jump_row][jump_col] != 0:
+                continue
+
+            path.append((jump_row, jump_col))
+            captured.append((row + step, col + side))
+            yield Move(start, path, captured)
+            yield from self._iter_jumps(start, jump_row, jump_col, step, color, path, captured)
+            path.pop()
+            captured.pop()
 
     def remove(self, pieces):
         """
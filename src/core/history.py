@@ -0,0 +1,152 @@
+import json
+from .gameboard import Gameboard
+from .move import Move
+
+class MoveHistory:
+    """
+    A class that records the moves played in a game, and supports undo, redo and replay. Only the moves and their undo information are stored, never copies of the board.
+
+    Attributes:
+    moves (list): The Move objects played so far, including the ones that were undone and can be redone.
+    undos (list): The undo information returned by Gameboard.make_move for every move in moves.
+    cursor (int): The number of moves currently played on the board. Moves from cursor onwards can be redone.
+    """
+    def __init__(self):
+        """
+        Initializes an empty move history.
+        """
+        self.moves = []
+        self.undos = []
+        self.cursor = 0
+
+    def push(self, move, undo):
+        """
+        Records a move that has just been played on the board. Any undone moves that could have been redone are discarded.
+
+        Parameters:
+        move (Move): The move that was played.
+        undo (tuple): The undo information returned by Gameboard.make_move for that move.
+        """
+        del self.moves[self.cursor:]
+        del self.undos[self.cursor:]
+        self.moves.append(move)
+        self.undos.append(undo)
+        self.cursor += 1
+
+    def can_undo(self) -> bool:
+        """
+        Returns True if there is a move to undo, False otherwise.
+        """
+        return self.cursor > 0
+
+    def can_redo(self) -> bool:
+        """
+        Returns True if there is an undone move to redo, False otherwise.
+        """
+        return self.cursor < len(self.moves)
+
+    def undo(self, board):
+        """
+        Takes back the last played move on the board.
+
+        Parameters:
+        board (Gameboard): The board the moves were played on.
+
+        Returns:
+        Move or None: The move that was taken back, or None if there is nothing to undo.
+        """
+        if not self.can_undo():
+            return None
+        self.cursor -= 1
+        move = self.moves[self.cursor]
+        board.undo_move(move, self.undos[self.cursor])
+        return move
+
+    def redo(self, board):
+        """
+        Plays again the last move that was taken back.
+
+        Parameters:
+        board (Gameboard): The board the moves were played on.
+
+        Returns:
+        Move or None: The move that was played again, or None if there is nothing to redo.
+        """
+        if not self.can_redo():
+            return None
+        move = self.moves[self.cursor]
+        self.undos[self.cursor] = board.make_move(move)
+        self.cursor += 1
+        return move
+
+    def played(self):
+        """
+        Returns the list of moves currently played on the board, from the first one to the last one.
+
+        Returns:
+        list: A list of Move objects.
+        """
+        return self.moves[:self.cursor]
+
+    def last_move(self):
+        """
+        Returns the last played move, or None if no move was played yet.
+        """
+        return self.moves[self.cursor - 1] if self.cursor else None
+
+    def replay(self):
+        """
+        Replays the played moves on a new gameboard, one at a time. The same gameboard object is yielded after every move, so it should not be kept between steps.
+
+        Yields:
+        (Move, Gameboard): The move and the gameboard after that move is played.
+        """
+        board = Gameboard()
+        for move in self.played():
+            board.make_move(move)
+            yield move, board
+
+    def to_record(self, winner=None):
+        """
+        Returns the played moves as a game record that can be stored as JSON.
+
+        Parameters:
+        winner (str or None): The winner of the game, or None if there is no winner.
+
+        Returns:
+        dict: A dictionary with the 'moves' played, as returned by Move.to_list, and the 'winner'.
+        """
+        return {'moves': [move.to_list() for move in self.played()], 'winner': winner}
+
+    def save(self, path, winner=None):
+        """
+        Appends the game record to a file that holds one JSON game record per line.
+
+        Parameters:
+        path (str): The path of the file.
+        winner (str or None): The winner of the game, or None if there is no winner.
+        """
+        with open(path, 'a') as file:
+            file.write(json.dumps(self.to_record(winner)) + '\n')
+
+    def __len__(self):
+        """
+        Returns the number of moves currently played on the board.
+        """
+        return self.cursor
+
+
+def load_games(path):
+    """
+    Reads the game records saved with MoveHistory.save. The games are numbered by their line in the file, so the numbers stay the same as long as games are only appended.
+
+    Parameters:
+    path (str): The path of the file.
+
+    Yields:
+    (int, list): The number of the game and the list of its Move objects.
+    """
+    with open(path) as file:
+        for number, line in enumerate(file):
+            if line.strip():
+                yield number, [Move.from_list(move) for move in json.loads(line)['moves']]
@@ -0,0 +1,73 @@
+class Move:
+    """
+    A class that represents a single move of a piece on the draughts board.
+
+    All squares are (row, col) tuples.
+
+    Attributes:
+    start (tuple): The row and column indices of the square the piece moves from.
+    path (tuple): The row and column indices of every square the piece lands on, in order. The last one is the destination.
+    captured (tuple): The row and column indices of the squares of the pieces jumped over, in the order they are captured.
+    """
+    __slots__ = ('start', 'path', 'captured')
+
+    def __init__(self, start, path, captured=()):
+        """
+        Initializes the move object with a start square, a path of landing squares and the captured squares.
+        """
+        self.start = start
+        self.path = tuple(path)
+        self.captured = tuple(captured)
+
+    @property
+    def end(self):
+        """
+        Returns the row and column indices of the destination square.
+        """
+        return self.path[-1]
+
+    def is_capture(self) -> bool:
+        """
+        Returns True if the move jumps over at least one piece, False otherwise.
+        """
+        return bool(self.captured)
+
+    def to_list(self):
+        """
+        Returns the move as nested lists of integers, so it can be stored in a game record.
+
+        Returns:
+        list: A list of the start square, the path and the captured squares.
+        """
+        return [list(self.start), [list(square) for square in self.path], [list(square) for square in self.captured]]
+
+    @classmethod
+    def from_list(cls, data):
+        """
+        Creates a move from the nested lists returned by to_list.
+
+        Parameters:
+        data (list): A list of the start square, the path and the captured squares.
+
+        Returns:
+        Move: The move described by the data.
+        """
+        start, path, captured = data
+        return cls(tuple(start), [tuple(square) for square in path], [tuple(square) for square in captured])
+
+    def __eq__(self, other):
+        if not isinstance(other, Move):
+            return NotImplemented
+        return self.start == other.start and self.path == other.path and self.captured == other.captured
+
+    def __hash__(self):
+        return hash((self.start, self.path, self.captured))
+
+    def __repr__(self):
+        """
+        Returns a string representation of the move, e.g. (5, 0)->(3, 2)x(4, 1).
+        """
+        text = '->'.join(str(square) for square in (self.start,) + self.path)
+        if self.captured:
+            text += 'x' + 'x'.join(str(square) for square in self.captured)
+        return text
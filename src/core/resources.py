@@ -0,0 +1,90 @@
+import os
+import pygame
+
+SOUNDS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'sounds')
+
+class Resources:
+    """
+    A class that loads fonts, sounds and pre-rendered surfaces the first time they are needed, and reuses them afterwards on every screen.
+
+    Attributes:
+    fonts (dict): Maps a font size to the loaded default font of that size.
+    sounds (dict): Maps a sound file name to the loaded sound.
+    texts (dict): Maps a (text, size, color) tuple to the rendered text surface.
+    surfaces (dict): Maps a name to a surface created by a factory function, e.g. the board background.
+    """
+    def __init__(self):
+        """
+        Initializes the resources with empty caches. Nothing is loaded until it is asked for.
+        """
+        self.fonts = {}
+        self.sounds = {}
+        self.texts = {}
+        self.surfaces = {}
+
+    def font(self, size):
+        """
+        Returns the default pygame font of a given size, loading it on first use.
+
+        Parameters:
+        size (int): The size of the font.
+
+        Returns:
+        pygame.font.Font: The font.
+        """
+        if size not in self.fonts:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            self.fonts[size] = pygame.font.Font(None, size)
+        return self.fonts[size]
+
+    def sound(self, name):
+        """
+        Returns a sound from the sounds directory, loading it on first use.
+
+        Parameters:
+        name (str): The file name of the sound, e.g. 'jump_sound.wav'.
+
+        Returns:
+        pygame.mixer.Sound: The sound.
+        """
+        if name not in self.sounds:
+            if not pygame.mixer.get_init():
+                pygame.mixer.init()
+            self.sounds[name] = pygame.mixer.Sound(os.path.join(SOUNDS_DIR, name))
+        return self.sounds[name]
+
+    def text(self, text, size, color):
+        """
+        Returns a text rendered with the default font, rendering it on first use.
+
+        Parameters:
+        text (str): The text to render.
+        size (int): The size of the font.
+        color (tuple): The color of the text.
+
+        Returns:
+        pygame.Surface: The rendered text.
+        """
+        key = (text, size, color)
+        if key not in self.texts:
+            self.texts[key] = self.font(size).render(text, True, color)
+        return self.texts[key]
+
+    def surface(self, name, factory):
+        """
+        Returns a named surface, creating it with the factory function on first use.
+
+        Parameters:
+        name (str): The name of the surface.
+        factory (callable): A function without arguments that returns the surface.
+
+        Returns:
+        pygame.Surface: The surface.
+        """
+        if name not in self.surfaces:
+            self.surfaces[name] = factory()
+        return self.surfaces[name]
+
+
+resources = Resources()
@@ -0,0 +1,90 @@
+"""
+Canonical form of positions under the color swap combined with a 180 degree rotation of the board.
+
+Rotating the board by 180 degrees and swapping the colors of the pieces (and of the player to move) gives an equivalent position: white men
+still move up, black men still move down, and every score is negated. Keying caches on the canonical form lets both positions share one entry.
+"""
+from .constants import BLACK, ROWS, COLS
+from .move import Move
+
+# The dark squares in row-major order. The 180 degree rotation maps the n-th square to the n-th square from the end.
+DARK_SQUARES = [(row, col) for row in range(ROWS) for col in range(COLS) if (row + col) % 2 == 1]
+
+EMPTY, BLACK_MAN, BLACK_KING, WHITE_MAN, WHITE_KING = range(5)
+BLACK_TO_MOVE, WHITE_TO_MOVE = 5, 6
+
+# Swaps the colors of the pieces and of the player to move
+_SWAP_COLORS = bytes.maketrans(bytes([BLACK_MAN, BLACK_KING, WHITE_MAN, WHITE_KING, BLACK_TO_MOVE, WHITE_TO_MOVE]),
+                               bytes([WHITE_MAN, WHITE_KING, BLACK_MAN, BLACK_KING, WHITE_TO_MOVE, BLACK_TO_MOVE]))
+
+def position_key(board, color):
+    """
+    Returns a key that identifies a position and the player to move.
+
+    Parameters:
+    board (Gameboard): The position.
+    color (int): The color of the player to move (WHITE or BLACK).
+
+    Returns:
+    bytes: One byte for the player to move followed by one byte for each dark square.
+    """
+    squares = board.gameboard
+    codes = [BLACK_TO_MOVE if color == BLACK else WHITE_TO_MOVE]
+    for row, col in DARK_SQUARES:
+        piece = squares[row][col]
+        if piece == 0:
+            codes.append(EMPTY)
+        elif piece.color == BLACK:
+            codes.append(BLACK_KING if piece.king else BLACK_MAN)
+        else:
+            codes.append(WHITE_KING if piece.king else WHITE_MAN)
+    return bytes(codes)
+
+def mirror_key(key):
+    """
+    Returns the key of the position with the colors swapped and the board rotated by 180 degrees.
+
+    Parameters:
+    key (bytes): A key returned by position_key.
+
+    Returns:
+    bytes: The key of the mirrored position.
+    """
+    swapped = key.translate(_SWAP_COLORS)
+    return swapped[:1] + swapped[:0:-1]
+
+def canonical_key(board, color):
+    """
+    Returns the canonical key of a position, which is the same for the position and its mirror, and whether the position had to be mirrored to get it.
+
+    Parameters:
+    board (Gameboard): The position.
+    color (int): The color of the player to move (WHITE or BLACK).
+
+    Returns:
+    (bytes, bool): The canonical key, and True if it is the key of the mirrored position.
+    """
+    key = position_key(board, color)
+    mirrored = mirror_key(key)
+    if mirrored < key:
+        return mirrored, True
+    return key, False
+
+def mirror_square(square):
+    """
+    Returns the square a square is moved to by the 180 degree rotation.
+    """
+    row, col = square
+    return ROWS - 1 - row, COLS - 1 - col
+
+def mirror_move(move):
+    """
+    Returns the move in the mirrored position that corresponds to a move. The transform is its own inverse, so it also maps moves of the mirrored position back.
+
+    Parameters:
+    move (Move): The move to mirror.
+
+    Returns:
+    Move: The mirrored move.
+    """
+    return Move(mirror_square(move.start), [mirror_square(square) for square in move.path], [mirror_square(square) for square in move.captured])